@@ -1,5 +1,14 @@
 import re, os
-from types import FunctionType, BuiltinFunctionType, MethodType # to check for function types
+from functools import lru_cache
+from types import MappingProxyType
+
+_NEWLINE_RE = re.compile(r'\r\n?') # CRLF and lone CR, same as text mode's universal newlines
+_MISSING = object() # sentinel for dict lookups, so a single .get() tells us whether a name is registered
+
+class _FunctionToken(Exception):
+    '''
+    Raised when a string sent down the cached path turns out to call a function, functions can have side effects so their output is never cached
+    '''
 
 class Reader():
     '''
@@ -29,20 +38,56 @@ class Reader():
 
     print(tfx.execute('1-1 = <<minus(1, 1)>>'))
     ```
+
+    :performance:
+    Rendering is memory-bound, it's mostly scanning and copying strings with no real math involved,
+    so the wins come from touching the bytes fewer times and not from clever instructions:
+
+    - the anchors are plain literals, so tokens are found with `str.find` instead of a regex
+    - `execute` renders in a single pass, collecting the pieces in a list and joining them once
+    - `execute_realtime` streams the file line by line instead of reading it whole
+    - short variable-only strings are memoized with an lru cache, keyed on the string, the anchors and a version that every registration bumps
+
+    `variables` and `functions` are read-only views, use the `register_*` methods to change them so the cache stays valid.
     '''
 
+    _QUOTE_TABLE = str.maketrans('', '', '"\'') # deletes both quote characters in a single pass
+    _CACHE_MAX_LEN = 4096 # longer strings (whole files) skip the execute cache so they aren't pinned in memory
+
     def __init__(self, user, theme, anchor_left='<<', anchor_right='>>', buffer=16*1024*1024, debug=False, encoding='utf-8'):
 
+        if not anchor_left or not anchor_right:
+            raise Exception('ERROR, anchors can not be empty!')
+
         self.user = user
         self.theme = theme
-        self.variables = {}
-        self.functions = {}
+        self._variables = {}
+        self._functions = {}
+        self._version = 0 # bumped on every registration, part of the execute cache key
         self.anchor_left = anchor_left
         self.anchor_right = anchor_right
         self.buffer = buffer
         self.debug = debug
         self.encoding = encoding
 
+        self._exec_cache = lru_cache(maxsize=4096)(self._execute_pure) # memoizes variable-only strings
+
+    @property
+    def variables(self) -> MappingProxyType:
+        '''
+        Read-only view of the registered variables
+        '''
+
+        return MappingProxyType(self._variables)
+
+    @property
+    def functions(self) -> MappingProxyType:
+        '''
+        Read-only view of the registered functions
+        '''
+
+        return MappingProxyType(self._functions)
+
     def __debug(self, msg) -> None:
         '''
         __debug(message to display) -> None
@@ -57,40 +102,25 @@ class Reader():
             return
 
         print(f'[DEBUG] {str(msg)}')
-    
-    def __strip_prefix(self, text, prefix=' ') -> str:
-        '''
-        __strip_prefix(text to clean, prefix to strip) -> str
-
-        Strips a text's prefix until its completely stripped
 
-        :param text str: Text to be stripped
-        :param prefix str: Prefix to strip
-        :return str: Stripped text
-        '''
-
-        final=text
-        while final.startswith(prefix):
-            final=final.removeprefix(prefix)
-        
-        return final
-    
-    def __strip_suffix(self, text, suffix=' ') -> str:
+    def __check_variable(self, name, value) -> None:
         '''
-        __strip_suffix(text to clean, suffix to strip) -> str
+        __check_variable(variable name, variable value) -> None
 
-        Strips a text's suffix until its completely stripped
+        Makes sure both the name and value of a variable are strings
 
-        :param text str: Text to be stripped
-        :param suffix str: Suffix to strip
-        :return str: Stripped text
+        :param name str: Name of the variable
+        :param value str: Value of the variable
+        :returns None: Nothing
         '''
 
-        final=text
-        while final.endswith(suffix):
-            final=final.removesuffix(suffix)
+        if not isinstance(name, str):
+            self.__debug(f'Type of name is not str, throwing error')
+            raise Exception(f'ERROR, name should be of type "str", and not "{str(type(name))}"!')
         
-        return final
+        if not isinstance(value, str):
+            self.__debug(f'Type of value is not str, throwing error')
+            raise Exception(f'ERROR, value should be of type "str", and not "{str(type(value))}"!')
 
     def register_variable(self, name, value) -> None:
         '''
@@ -103,19 +133,14 @@ class Reader():
         :returns None: Nothing
         '''
 
-        if type(name) != str:
-            self.__debug(f'Type of name is not str, throwing error')
-            raise Exception(f'ERROR, name should be of type "str", and not "{str(type(name))}"!')
-        
-        if type(value) != str:
-            self.__debug(f'Type of value is not str, throwing error')
-            raise Exception(f'ERROR, value should be of type "str", and not "{str(type(value))}"!')
+        self.__check_variable(name, value)
 
-        if name in self.variables.keys():
+        if name in self._variables:
             self.__debug(f'Duplicate variable name found, throwing error')
             raise Exception(f"ERROR, a variable with the name {name} already exists.")
 
-        self.variables[name] = value
+        self._variables[name] = value
+        self._version += 1
 
     def register_function(self, name, func):
         '''
@@ -128,19 +153,20 @@ class Reader():
         :returns None: Nothing
         '''
 
-        if type(name) != str:
+        if not isinstance(name, str):
             self.__debug(f'Type of name is not str, throwing error')
             raise Exception(f'ERROR, name should be of type "str", and not "{str(type(name))}"!')
         
-        if type(func) not in [FunctionType, BuiltinFunctionType, MethodType]:
+        if not callable(func):
             self.__debug(f'Type of func is not function, throwing error')
             raise Exception(f'ERROR, func should be of type "function", and not "{str(type(func))}"!')
 
-        if name in self.functions.keys():
+        if name in self._functions:
             self.__debug(f'Duplicate function name found, throwing error')
             raise Exception(f"ERROR, a function with the name {name} already exists.")
 
-        self.functions[name] = func
+        self._functions[name] = func
+        self._version += 1
     
     def register_dict(self, data) -> None:
         '''
@@ -152,13 +178,21 @@ class Reader():
         :returns None: Nothing
         '''
 
-        if type(data) != dict:
+        if not isinstance(data, dict):
             self.__debug(f'Type of data is not dict, throwing error')
 
             raise Exception(f'ERROR, data should be of type "dict", and not "{str(type(data))}"!')
 
-        for name, value in data.items():
-            self.register_variable(name, value)
+        for name, value in data.items(): # validate everything first, so a bad entry doesn't leave the dict half registered
+            self.__check_variable(name, value)
+
+        duplicate = next((name for name in data if name in self._variables), _MISSING) # first one in data order, so the error is deterministic
+        if duplicate is not _MISSING:
+            self.__debug(f'Duplicate variable name found, throwing error')
+            raise Exception(f"ERROR, a variable with the name {duplicate} already exists.")
+
+        self._variables.update(data)
+        self._version += 1
 
     def stripper(self, string) -> str:
         '''
@@ -170,10 +204,7 @@ class Reader():
         :returns str: Stripped string
         '''
 
-        for x in ['"', "'"]:
-            string=string.replace(x, "")
-
-        return string
+        return string.translate(self._QUOTE_TABLE)
    
 
     def execute_file(self, theme, file) -> str:
@@ -190,10 +221,13 @@ class Reader():
             self.__debug(f'Could not find file "{file}", throwing exception')
             raise Exception('ERROR, file not found!')
 
-        with open(file, buffering=self.buffer, encoding=self.encoding) as f:
-            output = self.execute(f.read())
+        with open(file, 'rb', buffering=self.buffer) as f:
+            data = f.read().decode(self.encoding) # decode everything at once instead of going through the text layer
 
-        return output
+        if '\r' in data: # same newline handling as text mode, done in a single pass
+            data = _NEWLINE_RE.sub('\n', data)
+
+        return self.execute(data)
 
     def execute_realtime(self, theme, file, func) -> None:
         '''
@@ -211,8 +245,8 @@ class Reader():
             raise Exception('ERROR, file not found!')
 
         with open(file, buffering=self.buffer, encoding=self.encoding) as f:
-            for line in f.read().split("\n"):
-                func(self.execute(line))
+            for line in f: # stream the file instead of reading it whole, keeps memory bound to a single line
+                func(self.execute(line.rstrip('\n')))
 
     def anchor(self, text) -> str:
         '''
@@ -226,55 +260,168 @@ class Reader():
 
         return f'{self.anchor_left}{text}{self.anchor_right}'
 
-    def execute(self, string) -> str:
+    def _parse_arg(self, arg):
         '''
-        execute(string to execute) -> str
+        _parse_arg(argument text) -> int | float | str
 
-        This is where the magic happens, basically runs over a string and replaces the variables and functions with the registered output
+        Converts a function argument to an int or float when it looks numeric, otherwise strips its quotes
+
+        :param arg str: Stripped argument text
+        :returns int | float | str: Parsed argument
+        '''
+
+        digits = arg.lstrip('+-')
+
+        try:
+            if digits.isdigit():
+                return int(arg)
+
+            if not digits.endswith('.') and digits.replace('.', '', 1).isdigit(): # plain decimals only, no trailing dot, exponents, underscores, "inf" or "nan"
+                return float(arg)
+        except ValueError: # e.g. "+-5" or unicode digits such as "²"
+            pass
+
+        return self.stripper(arg)
+
+    def _resolve(self, value, functions=True):
+        '''
+        _resolve(text between the anchors, wether functions may be called) -> str | None
+
+        Resolves a single token into its variable value or function output
+
+        :param value str: Text that was found between the anchors
+        :param functions bool: Wether functions may be called, defaults to "True"
+        :returns str | None: Resolved text, or None if the token should be left untouched
+        :raises _FunctionToken: If functions is False and the token would call a function
+        '''
+
+        value_stripped = value.strip() # strip extra whitespace
+
+        name = self._variables.get(value_stripped.removeprefix('$'), _MISSING)
+
+        if name is not _MISSING or ('$' in value_stripped): # variable
+
+            if name is _MISSING: # not found? we ignore it
+                self.__debug('Variable does not exist, silently ignoring.')
+                return None
+
+            self.__debug(f'Found variable "{value_stripped}"')
+
+            return str(name)
+
+        elif value_stripped in self._functions or ('(' in value_stripped and ')' in value_stripped): # function
+
+            if not functions:
+                raise _FunctionToken()
+
+            lparen = value_stripped.find("(")
+            fname = value_stripped[:lparen] if lparen >= 0 else value_stripped
+
+            getfunc = self._functions.get(fname, _MISSING)
+            if getfunc is _MISSING: # didn't find anything? if so, skip
+                self.__debug('Function does not exist, silently ignoring.')
+                return None
+
+            self.__debug(f'Found function "{value_stripped}"')
+
+            arg_str = value_stripped[lparen + 1:value_stripped.rfind(")")].strip() if lparen >= 0 else ""
+            arglist = [x.strip() for x in arg_str.split(",")] if arg_str else [] # remove extra whitespace, can lead to errors when checking for type if not stripped
+
+            func_output = getfunc(*[self._parse_arg(x) for x in arglist]) # an empty arglist simply calls the function without arguments
+
+            return "" if func_output is None else str(func_output)
+
+        return None # neither a variable nor a function, leave it as is
+
+    def _iter_tokens(self, string):
+        '''
+        _iter_tokens(string to scan) -> generator
+
+        Finds every token between the anchors using plain str.find calls, tokens never span multiple lines
+
+        :param string str: String to scan
+        :returns generator: Yields (start, end, token) for every anchored token, start and end include the anchors
+        '''
+
+        al, ar = self.anchor_left, self.anchor_right
+        L, R = len(al), len(ar)
+
+        idx = 0
+        while True:
+            i = string.find(al, idx)
+            if i < 0:
+                break
+
+            nl = string.find('\n', i + L)
+            j = string.find(ar, i + L, nl + R if nl >= 0 else len(string)) # tokens can't cross a newline, so only search the rest of this line
+            if j < 0: # no right anchor on this line, try again from the next character
+                idx = i + 1
+                continue
+
+            yield (i, j + R, string[i + L:j])
+            idx = j + R
+
+    def _render(self, string, functions=True) -> str:
+        '''
+        _render(string to execute, wether functions may be called) -> str
+
+        Walks over the tokens, collects the literal text and resolved values in a list and joins everything together once, so no intermediate copies of the whole string are made
 
         :param string str: String to execute
+        :param functions bool: Wether functions may be called, defaults to "True"
         :returns str: Output of the "compiled"/"executed" string
         '''
 
-        output = string
+        out = []
+        last = 0
 
-        for line in re.findall(self.anchor(r'(.*?)'), string): # grab everything in between the anchors
+        for i, j, token in self._iter_tokens(string):
+            resolved = self._resolve(token, functions)
+            if resolved is None: # untouched tokens simply stay part of the next literal slice
+                continue
 
-            value = line[0] if type(line) == list else line # somehow i had lists instead of strings when i was debugging it a while ago, so this is just a safety measure
-            value_stripped = self.__strip_prefix(self.__strip_suffix(value)) # strip extra whitespace
+            out.append(string[last:i])
+            out.append(resolved)
+            last = j
 
-            if value_stripped.removeprefix('$') in self.variables.keys() or ('$' in value_stripped): # variable
+        out.append(string[last:])
 
-                name = self.variables.get(value_stripped.removeprefix('$'))
-                if not name: # not found? we ignore it
-                    self.__debug('Variable does not exist, silently ignoring.')
-                    continue
+        return ''.join(out)
 
-                self.__debug(f'Found variable "{value_stripped}"')
+    def _execute_pure(self, string, anchor_left, anchor_right, version):
+        '''
+        _execute_pure(string to execute, left anchor, right anchor, registration version) -> str | None
 
-                output = output.replace(self.anchor(value), str(name))
+        Executes a string that only contains variables, wrapped by the lru cache in __init__
 
-            elif value_stripped in self.functions.keys() or ('(' in value_stripped and ')' in value_stripped): # function
+        :param string str: String to execute
+        :param anchor_left str: Current left anchor, only used as part of the cache key
+        :param anchor_right str: Current right anchor, only used as part of the cache key
+        :param version int: Current registration version, only used as part of the cache key
+        :returns str | None: Output of the "compiled"/"executed" string, or None if it calls a function so that verdict gets cached too
+        '''
 
-                getfunc = self.functions.get(value_stripped.split("(")[0])
-                if not getfunc: # didn't find anything? if so, skip
-                    self.__debug('Function does not exist, silently ignoring.')
-                    continue
+        try:
+            return self._render(string, functions=False)
+        except _FunctionToken:
+            return None
 
-                self.__debug(f'Found function "{value_stripped}"')
+    def execute(self, string) -> str:
+        '''
+        execute(string to execute) -> str
 
-                arguments = value_stripped.split("(")[1].split(")")[0]
-                arglist = arguments.split(",") if len(arguments.split(",")) > 1 else [arguments]
+        This is where the magic happens, basically runs over a string and replaces the variables and functions with the registered output
+
+        :param string str: String to execute
+        :returns str: Output of the "compiled"/"executed" string
+        '''
 
-                arguments = []
-                for x in arglist:
-                    x = self.__strip_prefix(self.__strip_suffix(x)) # remove extra whitespace, can lead to errors when checking for type if not stripped
-                    arguments.append(int(x) if x.isdigit() else float(x) if bool(re.match(r"^-?\d+(?:\.\d+)$", x)) else self.stripper(x))
+        if self.anchor_left not in string: # no anchors means nothing to resolve, return the string as is
+            return string
 
-                # run with or without arguments
-                if arglist[0] == "" or len(arglist) <= 0: func_output = getfunc()
-                else: func_output = getfunc(*arguments)
-                
-                output = output.replace(self.anchor(value), "" if func_output is None else str(func_output))
+        if not self.debug and len(string) <= self._CACHE_MAX_LEN and '(' not in string: # short and most likely variables only, try the memoized path first
+            output = self._exec_cache(string, self.anchor_left, self.anchor_right, self._version)
+            if output is not None: # None means it calls a function (bare name), those always run
+                return output
 
-        return output # return the output
+        return self._render(string)